@@ -1,12 +1,23 @@
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from sqlalchemy import create_engine, Column, String, Integer, DateTime
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+from cachetools import TTLCache
+from sqlalchemy import event, select, bindparam, update, delete, func, Column, String, Integer, DateTime, Index
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
-import docker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+import aiodocker
+import aiofiles
+import aiofiles.os
+import asyncio
+import json
+import logging
 import os
 import secrets
+import shutil
 import string
 from datetime import datetime
 import subprocess
@@ -15,12 +26,19 @@ import subprocess
 # КОНФИГУРАЦИЯ
 # ====================================================================
 
-DATABASE_URL = "sqlite:///./bothost.db"
-DOCKER_IMAGE = "python:3.11-slim"
+DATABASE_URL = "sqlite+aiosqlite:///./bothost.db"
+DOCKER_IMAGE = "bothost/bot-runtime:latest"  # см. bot-runtime/Dockerfile
 BASE_DOMAIN = "bothost.local"
 PORT_START = 5001
+WARM_POOL_SIZE = 4
+BOT_CMD = "python /app/bot_server.py"
+BOTS_DIR = "/tmp/bots/_pool"
+
+os.makedirs(BOTS_DIR, exist_ok=True)
+
+logger = logging.getLogger(__name__)
 
-app = FastAPI(title="BotHost API")
+app = FastAPI(title="BotHost API", default_response_class=ORJSONResponse)
 
 # CORS для фронтенда
 app.add_middleware(
@@ -35,16 +53,56 @@ app.add_middleware(
 # БАЗА ДАННЫХ
 # ====================================================================
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_async_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False, "timeout": 30},
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=10,
+    max_overflow=20,
+    pool_pre_ping=True
+)
+
+@event.listens_for(engine.sync_engine, "connect")
+def _pragmas(dbapi_conn, _):
+    """WAL + тюнинг SQLite на каждом новом соединении"""
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("PRAGMA synchronous=NORMAL")
+    cur.execute("PRAGMA temp_store=MEMORY")
+    cur.execute("PRAGMA cache_size=-8000")
+    cur.execute("PRAGMA mmap_size=268435456")
+    cur.close()
+
+# Чтение без BEGIN/COMMIT, запись - в обычной транзакции
+ReadSession = async_sessionmaker(
+    engine.execution_options(isolation_level="AUTOCOMMIT"),
+    autoflush=False,
+    expire_on_commit=False
+)
+WriteSession = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_read_db():
+    async with ReadSession() as db:
+        yield db
+
+async def get_write_db():
+    async with WriteSession() as db:
         yield db
-    finally:
-        db.close()
+
+# ====================================================================
+# DOCKER
+# ====================================================================
+
+docker_client: aiodocker.Docker = None
+
+def connect_docker():
+    """Клиент Docker создаётся лениво: без сокета API всё равно должен стартовать"""
+    # aiohttp-сессия создаётся внутри event loop
+    global docker_client
+    if docker_client is None:
+        docker_client = aiodocker.Docker()
+    return docker_client
 
 # ====================================================================
 # МОДЕЛИ БД
@@ -52,18 +110,60 @@ def get_db():
 
 class BotModel(Base):
     __tablename__ = "bots"
+    __table_args__ = (Index("ix_bots_user_name", "user_id", "name"),)
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, index=True)
     token = Column(String)
-    user_id = Column(String)
-    port = Column(Integer)
+    user_id = Column(String, index=True)
+    port = Column(Integer, index=True)
     container_id = Column(String)
     webhook_url = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
     is_running = Column(Integer, default=0)
 
-Base.metadata.create_all(bind=engine)
+class ReleasedPort(Base):
+    """Порты удалённых ботов, которые можно выдать повторно"""
+    __tablename__ = "released_ports"
+    
+    port = Column(Integer, primary_key=True, autoincrement=False)
+
+@app.on_event("startup")
+async def init_db():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        # create_all не добавляет индексы в уже существующую таблицу
+        await conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_bots_user_id ON bots(user_id)")
+        await conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_bots_user_name ON bots(user_id, name)")
+        await conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_bots_port ON bots(port)")
+        # Имена, занятые create_bot до падения процесса: контейнер так и не был назначен
+        await conn.execute(delete(BotModel).where(BotModel.container_id.is_(None)))
+        
+        # Новые порты выдаются из счётчика в памяти, освобождённые - из released_ports
+        global next_port
+        result = await conn.execute(select(
+            func.coalesce(func.max(BotModel.port), PORT_START - 1),
+            select(func.coalesce(func.max(ReleasedPort.port), PORT_START - 1)).scalar_subquery()
+        ))
+        next_port = max(result.one()) + 1
+
+# Запросы собираются один раз, параметры подставляются при выполнении
+STMT_BOT_BY_ID = select(BotModel).where(BotModel.id == bindparam("bid"))
+STMT_BOTS_BY_USER = select(
+    BotModel.id,
+    BotModel.name,
+    BotModel.token,
+    BotModel.webhook_url,
+    BotModel.port,
+    BotModel.is_running,
+    BotModel.created_at
+).where(BotModel.user_id == bindparam("uid"))
+STMT_POP_RELEASED_PORT = (
+    delete(ReleasedPort)
+    .where(ReleasedPort.port == select(func.min(ReleasedPort.port)).scalar_subquery())
+    .returning(ReleasedPort.port)
+    .execution_options(synchronize_session=False)
+)
 
 # ====================================================================
 # PYDANTIC МОДЕЛИ
@@ -75,10 +175,13 @@ class CreateBotRequest(BaseModel):
     user_id: str
 
 class BotResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
     id: int
     name: str
     token: str
     webhook_url: str
+    port: Optional[int] = None
     is_running: int
     created_at: datetime
 
@@ -86,18 +189,52 @@ class BotResponse(BaseModel):
 # УТИЛИТЫ
 # ====================================================================
 
-def generate_random_string(length=8):
-    return ''.join(secrets.choice(string.ascii_lowercase + string.digits) for _ in range(length))
+# Короткий кэш списка ботов: дашборд опрашивает /api/bots каждые несколько секунд
+bots_cache = TTLCache(maxsize=1024, ttl=2)
 
-def get_next_available_port(db: Session):
-    last_bot = db.query(BotModel).order_by(BotModel.port.desc()).first()
-    if last_bot:
-        return last_bot.port + 1
-    return PORT_START
+RANDOM_ALPHABET = string.ascii_lowercase + string.digits
 
-def create_bot_code(token: str, webhook_url: str):
-    """Генерирует bot_server.py с твоими параметрами"""
-    return f'''#!/usr/bin/env python3
+def generate_random_string(length=8):
+    # Один вызов getrandom вместо secrets.choice на каждый символ
+    return ''.join(RANDOM_ALPHABET[b % 36] for b in secrets.token_bytes(length))
+
+next_port = PORT_START
+port_lock = asyncio.Lock()
+
+async def get_next_available_port():
+    """Сначала наименьший освобождённый порт, иначе следующий из счётчика"""
+    global next_port
+    async with port_lock:
+        async with WriteSession() as db:
+            port = (await db.execute(STMT_POP_RELEASED_PORT)).scalar_one_or_none()
+            await db.commit()
+        if port is None:
+            port = next_port
+            next_port += 1
+    return port
+
+async def release_port(db: AsyncSession, port: int):
+    """Возвращает порт в released_ports (commit - на вызывающем)"""
+    # Порты не ниже счётчика он и так выдаст сам - иначе порт выдался бы дважды
+    if port is None or port >= next_port:
+        return
+    await db.execute(sqlite_insert(ReleasedPort).values(port=port).on_conflict_do_nothing())
+
+async def reserve_bot_name(db: AsyncSession, **values):
+    """Занимает имя бота одним INSERT; None - если такой бот уже есть"""
+    stmt = (
+        sqlite_insert(BotModel)
+        .values(**values)
+        .on_conflict_do_nothing(index_elements=["name"])
+        .returning(BotModel.id, BotModel.created_at)
+    )
+    row = (await db.execute(stmt)).one_or_none()
+    # Сразу отпускаем блокировку записи: пул контейнеров тоже пишет в БД
+    await db.commit()
+    return row
+
+# Шаблон bot_server.py: собирается один раз при импорте
+BOT_TEMPLATE = string.Template('''#!/usr/bin/env python3
 import logging
 from telegram import Update
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
@@ -110,8 +247,8 @@ app = Flask(__name__)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-TOKEN = "{token}"
-WEBHOOK_URL = "{webhook_url}"
+TOKEN = "$TOKEN"
+WEBHOOK_URL = "$WEBHOOK_URL"
 
 application = None
 
@@ -120,11 +257,11 @@ async def webhook():
     update_data = request.get_json()
     update = Update.de_json(update_data, application.bot)
     await application.process_update(update)
-    return {{"ok": True}}
+    return {"ok": True}
 
 @app.route('/health', methods=['GET'])
 def health():
-    return {{"status": "БОТ РАБОТАЕТ 24/7 ✅"}}
+    return {"status": "БОТ РАБОТАЕТ 24/7 ✅"}
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text("👋 Привет! Я работаю 24/7 на BotHost!")
@@ -143,7 +280,167 @@ if __name__ == '__main__':
     import asyncio
     asyncio.run(main())
     app.run(host='0.0.0.0', port=5000)
-'''
+''')
+
+def create_bot_code(token: str, webhook_url: str):
+    """Генерирует bot_server.py с твоими параметрами"""
+    return BOT_TEMPLATE.substitute(TOKEN=token, WEBHOOK_URL=webhook_url)
+
+# ====================================================================
+# ПУЛ ПРОГРЕТЫХ КОНТЕЙНЕРОВ
+# ====================================================================
+
+# Контейнеры уже запущены (sleep infinity), бот exec'ается в них при создании
+warm_pool: asyncio.Queue = asyncio.Queue(maxsize=WARM_POOL_SIZE)
+pool_has_room = asyncio.Event()
+pool_task = None
+
+async def start_idle_container():
+    """Запускает пустой контейнер со своей папкой /app и опубликованным портом"""
+    port = await get_next_available_port()
+    slot = generate_random_string()
+    bot_dir = f"{BOTS_DIR}/{slot}"
+    try:
+        try:
+            await aiofiles.os.mkdir(bot_dir)
+        except FileExistsError:
+            pass
+        container = await connect_docker().containers.run(
+            config={
+                "Image": DOCKER_IMAGE,
+                "Cmd": ["sleep", "infinity"],
+                "Labels": {"bothost.pool": "1", "bothost.port": str(port)},
+                "ExposedPorts": {"5000/tcp": {}},
+                "HostConfig": {
+                    "Binds": [f"{bot_dir}:/app:rw"],
+                    "PortBindings": {"5000/tcp": [{"HostPort": str(port)}]},
+                    "Init": True
+                }
+            },
+            name=f"bot-pool-{slot}"
+        )
+    except Exception:
+        # Контейнер не поднялся - папку удаляем, порт возвращаем
+        await remove_bot_dir(bot_dir)
+        async with WriteSession() as db:
+            await release_port(db, port)
+            await db.commit()
+        raise
+    return container, bot_dir, port
+
+async def acquire_container():
+    """Берёт контейнер из пула, а если пул пуст - запускает новый"""
+    try:
+        item = warm_pool.get_nowait()
+        pool_has_room.set()
+        return item
+    except asyncio.QueueEmpty:
+        return await start_idle_container()
+
+async def release_container(item):
+    """Возвращает неиспользованный контейнер в пул (или удаляет, если пул полон)"""
+    try:
+        warm_pool.put_nowait(item)
+    except asyncio.QueueFull:
+        await discard_container(item)
+
+async def remove_bot_dir(bot_dir):
+    """Удаляет папку бота: в bot_server.py лежит токен"""
+    # Трогаем только папки внутри /tmp/bots
+    if bot_dir and bot_dir.startswith(os.path.dirname(BOTS_DIR) + "/"):
+        await asyncio.to_thread(shutil.rmtree, bot_dir, ignore_errors=True)
+
+def bot_dir_of(info):
+    """Папка бота на хосте по описанию контейнера (первый bind)"""
+    binds = info["HostConfig"].get("Binds") or []
+    if not binds:
+        return None
+    source = binds[0].split(":")[0]
+    # Боты до пула контейнеров монтировали один bot_server.py
+    if source.endswith(".py"):
+        source = os.path.dirname(source)
+    return source
+
+async def discard_container(item):
+    """Удаляет контейнер пула, его папку и освобождает порт"""
+    container, bot_dir, port = item
+    await container.delete(force=True)
+    await remove_bot_dir(bot_dir)
+    async with WriteSession() as db:
+        await release_port(db, port)
+        await db.commit()
+
+async def start_bot_process(container):
+    """Запускает bot_server.py внутри контейнера"""
+    exec_ = await container.exec(BOT_CMD.split())
+    await exec_.start(detach=True)
+
+async def sweep_stale_containers():
+    """Удаляет неиспользованные контейнеры пула от прошлого запуска"""
+    # Фильтр name - регулярка по имени с ведущим "/", поэтому якорим её
+    stale = await connect_docker().containers.list(
+        all=True, filters=json.dumps({"label": ["bothost.pool=1"], "name": ["^/bot-pool-"]})
+    )
+    if not stale:
+        return
+    # Метка bothost.pool остаётся и на контейнерах, уже отданных ботам
+    async with ReadSession() as db:
+        result = await db.execute(
+            select(BotModel.container_id).where(BotModel.container_id.in_([c.id for c in stale]))
+        )
+        assigned = set(result.scalars())
+    global next_port
+    for container in stale:
+        if container.id in assigned:
+            continue
+        # Порт не возвращаем в released_ports: пока шла уборка, счётчик мог уже
+        # выдать его новому боту. Вместо этого поднимаем счётчик выше него
+        port = container["Labels"].get("bothost.port")
+        if port:
+            async with port_lock:
+                next_port = max(next_port, int(port) + 1)
+        slot = container["Names"][0][len("/bot-pool-"):]
+        await discard_container((container, f"{BOTS_DIR}/{slot}", None))
+
+async def fill_warm_pool():
+    swept = False
+    while True:
+        try:
+            if not swept:
+                await sweep_stale_containers()
+                swept = True
+            if warm_pool.full():
+                # Новый контейнер поднимаем только когда в пуле есть место,
+                # иначе он висел бы вне очереди и терялся при остановке
+                pool_has_room.clear()
+                await pool_has_room.wait()
+                continue
+            await release_container(await start_idle_container())
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Ошибка пула контейнеров: {str(e)}")
+            await asyncio.sleep(5)
+
+@app.on_event("startup")
+async def start_warm_pool():
+    global pool_task
+    # Ошибки Docker не должны мешать старту API - пул сам повторит попытку
+    pool_task = asyncio.create_task(fill_warm_pool())
+
+@app.on_event("shutdown")
+async def stop_warm_pool():
+    if pool_task:
+        pool_task.cancel()
+        await asyncio.gather(pool_task, return_exceptions=True)
+    while not warm_pool.empty():
+        try:
+            await discard_container(warm_pool.get_nowait())
+        except Exception as e:
+            logger.error(f"Ошибка удаления контейнера: {str(e)}")
+    if docker_client is not None:
+        await docker_client.close()
+    await engine.dispose()
 
 # ====================================================================
 # API ENDPOINTS
@@ -152,117 +449,153 @@ if __name__ == '__main__':
 @app.post("/api/bots/create")
 async def create_bot(
     req: CreateBotRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db)
 ):
     """Создаёт новый бот и запускает его в Docker"""
     
-    # Проверяем, не существует ли уже такой бот
-    existing = db.query(BotModel).filter(BotModel.name == req.name).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Бот с таким именем уже существует")
-    
-    # Получаем свободный порт
-    port = get_next_available_port(db)
     webhook_url = f"https://{req.name}.{BASE_DOMAIN}/webhook"
     
+    reserve = reserve_bot_name(
+        db,
+        name=req.name,
+        token=req.token,
+        user_id=req.user_id,
+        webhook_url=webhook_url,
+        is_running=0
+    )
+    if warm_pool.empty():
+        # Пул пуст: запуск нового контейнера идёт параллельно с INSERT
+        row, acquired = await asyncio.gather(
+            reserve, start_idle_container(), return_exceptions=True
+        )
+        if row is None or isinstance(row, Exception):
+            if not isinstance(acquired, Exception):
+                await release_container(acquired)
+            if isinstance(row, Exception):
+                raise row
+    else:
+        # Из пула берём только после проверки имени, чтобы дубль не тратил контейнер
+        row = await reserve
+        acquired = None
+    if row is None:
+        raise HTTPException(status_code=400, detail="Бот с таким именем уже существует")
+    bot_id, created_at = row
+    
     # Генерируем код бота
     bot_code = create_bot_code(req.token, webhook_url)
     
-    # Создаём папку для бота
-    bot_dir = f"/tmp/bots/{req.name}"
-    os.makedirs(bot_dir, exist_ok=True)
-    
-    # Пишем bot_server.py
-    with open(f"{bot_dir}/bot_server.py", "w") as f:
-        f.write(bot_code)
-    
-    # Пишем requirements.txt
-    with open(f"{bot_dir}/requirements.txt", "w") as f:
-        f.write("python-telegram-bot==20.7\nflask==3.0.0\nrequests==2.31.0\nsqlalchemy==2.0.0\n")
-    
-    # Запускаем Docker контейнер
+    # Запускаем бота в полученном контейнере
     try:
-        client = docker.from_env()
-        container = client.containers.run(
-            DOCKER_IMAGE,
-            f"cd /app && pip install -r requirements.txt && python bot_server.py",
-            volumes={bot_dir: {"bind": "/app", "mode": "rw"}},
-            ports={'5000/tcp': port},
-            detach=True,
-            name=f"bot-{req.name}"
-        )
+        if isinstance(acquired, Exception):
+            raise acquired
+        if acquired is None:
+            acquired = await acquire_container()
+        container, bot_dir, port = acquired
+        async with aiofiles.open(f"{bot_dir}/bot_server.py", "w") as f:
+            await f.write(bot_code)
+        await container.rename(f"bot-{req.name}")
+        await start_bot_process(container)
         container_id = container.id
     except Exception as e:
+        # Контейнер больше не нужен: удаляем его и возвращаем порт
+        if acquired is not None and not isinstance(acquired, Exception):
+            try:
+                await discard_container(acquired)
+            except Exception as discard_error:
+                logger.error(f"Ошибка удаления контейнера: {str(discard_error)}")
+        # Освобождаем имя
+        await db.execute(delete(BotModel).where(BotModel.id == bot_id))
+        await db.commit()
+        bots_cache.pop(req.user_id, None)
         raise HTTPException(status_code=500, detail=f"Docker ошибка: {str(e)}")
     
     # Сохраняем в БД
-    db_bot = BotModel(
-        name=req.name,
-        token=req.token,
-        user_id=req.user_id,
-        port=port,
-        container_id=container_id,
-        webhook_url=webhook_url,
-        is_running=1
+    result = await db.execute(
+        update(BotModel)
+        .where(BotModel.id == bot_id)
+        .values(port=port, container_id=container_id, is_running=1)
     )
-    db.add(db_bot)
-    db.commit()
-    db.refresh(db_bot)
+    await db.commit()
+    bots_cache.pop(req.user_id, None)
+    if result.rowcount == 0:
+        # Бота удалили, пока запускался контейнер
+        await discard_container(acquired)
+        raise HTTPException(status_code=409, detail="Бот удалён во время создания")
     
     return {
-        "id": db_bot.id,
-        "name": db_bot.name,
-        "webhook_url": db_bot.webhook_url,
+        "id": bot_id,
+        "name": req.name,
+        "webhook_url": webhook_url,
+        "created_at": created_at,
         "message": "✅ Бот создан и запущен!"
     }
 
-@app.get("/api/bots")
-async def list_bots(user_id: str, db: Session = Depends(get_db)):
+@app.get("/api/bots", response_model=list[BotResponse])
+async def list_bots(user_id: str, db: AsyncSession = Depends(get_read_db)):
     """Список ботов пользователя"""
-    bots = db.query(BotModel).filter(BotModel.user_id == user_id).all()
+    bots = bots_cache.get(user_id)
+    if bots is not None:
+        return bots
+    
+    result = await db.execute(STMT_BOTS_BY_USER, {"uid": user_id})
+    bots = result.all()
+    bots_cache[user_id] = bots
     return bots
 
 @app.get("/api/bots/{bot_id}")
-async def get_bot(bot_id: int, db: Session = Depends(get_db)):
+async def get_bot(bot_id: int, db: AsyncSession = Depends(get_read_db)):
     """Информация о боте"""
-    bot = db.query(BotModel).filter(BotModel.id == bot_id).first()
+    result = await db.execute(STMT_BOT_BY_ID, {"bid": bot_id})
+    bot = result.scalar_one_or_none()
     if not bot:
         raise HTTPException(status_code=404, detail="Бот не найден")
     return bot
 
 @app.delete("/api/bots/{bot_id}")
-async def delete_bot(bot_id: int, db: Session = Depends(get_db)):
+async def delete_bot(bot_id: int, db: AsyncSession = Depends(get_write_db)):
     """Удаляет бота"""
-    bot = db.query(BotModel).filter(BotModel.id == bot_id).first()
+    result = await db.execute(STMT_BOT_BY_ID, {"bid": bot_id})
+    bot = result.scalar_one_or_none()
     if not bot:
         raise HTTPException(status_code=404, detail="Бот не найден")
+    if bot.container_id is None:
+        raise HTTPException(status_code=409, detail="Бот ещё создаётся")
     
     # Останавливаем контейнер
     try:
-        client = docker.from_env()
-        container = client.containers.get(bot.container_id)
-        container.stop()
-        container.remove()
+        container = connect_docker().containers.container(bot.container_id)
+        info = await container.show()
+        await container.stop()
+        await container.delete()
+        await remove_bot_dir(bot_dir_of(info))
+        # Порт свободен только если контейнер действительно удалён
+        await release_port(db, bot.port)
     except Exception as e:
         logger.error(f"Ошибка удаления контейнера: {str(e)}")
     
     # Удаляем из БД
-    db.delete(bot)
-    db.commit()
+    await db.delete(bot)
+    await db.commit()
+    bots_cache.pop(bot.user_id, None)
     
     return {"message": "✅ Бот удален"}
 
 @app.post("/api/bots/{bot_id}/restart")
-async def restart_bot(bot_id: int, db: Session = Depends(get_db)):
+async def restart_bot(bot_id: int, db: AsyncSession = Depends(get_read_db)):
     """Перезагружает бота"""
-    bot = db.query(BotModel).filter(BotModel.id == bot_id).first()
+    result = await db.execute(STMT_BOT_BY_ID, {"bid": bot_id})
+    bot = result.scalar_one_or_none()
     if not bot:
         raise HTTPException(status_code=404, detail="Бот не найден")
     
     try:
-        client = docker.from_env()
-        container = client.containers.get(bot.container_id)
-        container.restart()
+        container = connect_docker().containers.container(bot.container_id)
+        info = await container.show()
+        await container.restart()
+        # В контейнерах из пула бот не основной процесс - запускаем его заново.
+        # Старые контейнеры запускают bot_server.py сами
+        if info["Config"]["Cmd"] == ["sleep", "infinity"]:
+            await start_bot_process(container)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ошибка: {str(e)}")
     